@@ -10,11 +10,15 @@ Usa dataclass frozen per riproducibilità + costanti legacy per compatibilità.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import bisect
+from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
+import numpy as np
+
 # -----------------------------
 # Path progetto / data
 # -----------------------------
@@ -44,7 +48,7 @@ DIFFICULTYFILE = _resolve_data_file("difficulty.json")
 # -----------------------------
 # Parametri modello (da paper + calcoli derivati)
 # -----------------------------
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PVSystemParams:
     """Parametri impianto FV (Table 5-7 paper)."""
 
@@ -55,14 +59,14 @@ class PVSystemParams:
     capex_totale_usd: float = 42_000_000.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnergyMarketParams:
     """Parametri mercato energia."""
 
     prezzo_vendita_usd_kwh: float = 0.094
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MiningParams:
     """
     Parametri farm mining (tabelle 2,8 paper).
@@ -76,15 +80,17 @@ class MiningParams:
     consumo_annuo_mwh: float = 80_766.0
     seconds_per_year: float = 365.25 * 24 * 3600
 
-    @property
-    def hashrate_sistema_hs(self) -> float:
+    # Derivato, calcolato una volta in __post_init__.
+    hashrate_sistema_hs: float = field(init=False)
+
+    def __post_init__(self) -> None:
         # Calcolo: Potenza netta / efficienza → TH/s → *1e12 → H/s.
         potenza_miners_w = (self.potenza_farm_mw * 1e6) / self.pue
         th_s = potenza_miners_w / self.efficienza_j_per_th
-        return th_s * 1e12
+        object.__setattr__(self, "hashrate_sistema_hs", th_s * 1e12)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnvironmentalParams:
     """Emissioni evitate (paper)."""
 
@@ -100,7 +106,7 @@ class EnvironmentalParams:
         return self.co2_evitata_ton_anno
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimulationParams:
     """Parametri intervallo simulazione."""
 
@@ -159,26 +165,11 @@ def getblockreward(year: int) -> float:
     return get_block_reward(year)
 
 
-def getblockreward_constant(year: int) -> float:
-    """Reward costante per epoca (scalini)."""
-    starts = sorted(HALVING_REWARD_BY_START_YEAR.keys())
-    chosen_start = starts[0]
-    for s in starts:
-        if year >= s:
-            chosen_start = s
-        else:
-            break
-    return float(HALVING_REWARD_BY_START_YEAR[chosen_start])
-
-
-def get_average_block_reward(year: int) -> float:
+def _average_reward_2020() -> float:
     """
-    Reward medio annuo (per 2020: media pre/post halving).
+    Reward medio 2020 (media pre/post halving).
     Halving 11/05/2020 → ~133 gg 12.5 BTC + 233 gg 6.25 BTC.
     """
-    if year != 2020:
-        return getblockreward_constant(year)
-
     halving_day = date(2020, 5, 11)
     year_start = date(2020, 1, 1)
     year_end = date(2021, 1, 1)
@@ -192,6 +183,36 @@ def get_average_block_reward(year: int) -> float:
     return float((reward_before * days_before + reward_after * days_after) / total_days)
 
 
+# Tabella halving precalcolata (lookup O(log n) via bisect/searchsorted).
+_HALVING_STARTS = np.array(sorted(HALVING_REWARD_BY_START_YEAR))
+_HALVING_REWARDS = np.array(
+    [HALVING_REWARD_BY_START_YEAR[y] for y in _HALVING_STARTS.tolist()],
+    dtype=np.float64,
+)
+_REWARD_2020 = _average_reward_2020()
+
+
+def getblockreward_constant(year: int) -> float:
+    """Reward costante per epoca (scalini)."""
+    idx = max(bisect.bisect_right(_HALVING_STARTS, year) - 1, 0)
+    return float(_HALVING_REWARDS[idx])
+
+
+@lru_cache(maxsize=64)
+def get_average_block_reward(year: int) -> float:
+    """Reward medio annuo (per 2020: media pre/post halving)."""
+    if year != 2020:
+        return getblockreward_constant(year)
+    return _REWARD_2020
+
+
+def get_block_reward_arr(years: np.ndarray) -> np.ndarray:
+    """Versione vettoriale di get_block_reward (reward medio annuo per array di anni)."""
+    years = np.asarray(years)
+    idx = np.clip(np.searchsorted(_HALVING_STARTS, years, side="right") - 1, 0, None)
+    return np.where(years == 2020, _REWARD_2020, _HALVING_REWARDS[idx])
+
+
 # Alias per compatibilità.
 PV_PARAMS = PVPARAMS
 ENERGY_PARAMS = ENERGYPARAMS
@@ -200,9 +221,8 @@ ENV_PARAMS = ENVPARAMS
 SIM_PARAMS = SIMPARAMS
 
 
-def get_block_reward(year: int) -> float:
-    """Reward medio annuo (default per simulazioni annuali)."""
-    return get_average_block_reward(year)
+# Reward medio annuo (default per simulazioni annuali): alias della versione cached.
+get_block_reward = get_average_block_reward
 
 
 __all__ = [
@@ -236,4 +256,5 @@ __all__ = [
     "ENV_PARAMS",
     "SIM_PARAMS",
     "get_block_reward",
+    "get_block_reward_arr",
 ]
@@ -4,10 +4,12 @@ Carica i dataset storici e prepara le serie annuali per la simulazione.
 Forward-fill per anni futuri (assunzione conservativa).
 """
 
-import json
 import logging
+from functools import lru_cache
 from typing import Dict, Tuple, Any
 
+import numpy as np
+import orjson
 import pandas as pd
 
 from src.config import constants as const
@@ -15,14 +17,39 @@ from src.config import constants as const
 logger = logging.getLogger(__name__)
 
 
+def _yearly_mean(years: np.ndarray, values: np.ndarray) -> Dict[int, float]:
+    """
+    Media per anno via np.unique + np.add.reduceat (senza groupby pandas).
+    Scarta valori/anni NaN come farebbe groupby().mean().
+    """
+    years = np.asarray(years, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~(np.isnan(years) | np.isnan(values))
+    years, values = years[valid].astype(np.int64), values[valid]
+    if values.size == 0:
+        return {}
+
+    order = np.argsort(years, kind="stable")
+    years, values = years[order], values[order]
+    uniq, first_idx = np.unique(years, return_index=True)
+    sums = np.add.reduceat(values, first_idx)
+    counts = np.diff(np.append(first_idx, values.size))
+    return dict(zip(uniq.tolist(), (sums / counts).tolist()))
+
+
 class PVDataLoader:
     """Carica produzione FV 2020 mensile da CSV (tabella 7 paper)."""
 
     @staticmethod
     def load() -> Tuple[pd.DataFrame, float]:
         """Legge CSV e valida totale 80890 MWh."""
-        df = pd.read_csv("data/pv_production.csv")
-        # Assumiamo colonna "energy_ac_mwh" dal dataset pv_production.csv
+        # Serve solo la colonna "energy_ac_mwh" dal dataset pv_production.csv.
+        df = pd.read_csv(
+            const.PVFILE,
+            usecols=["energy_ac_mwh"],
+            dtype={"energy_ac_mwh": "float64"},
+            engine="c",
+        )
         total = df["energy_ac_mwh"].sum()
         if abs(total - const.PV_PARAMS.energia_base_2020_mwh) > 809:
             logger.warning("Totale PV mismatch paper (atteso 80890 MWh)")
@@ -36,14 +63,20 @@ class BTCPriceLoader:
     @staticmethod
     def load() -> Dict[int, float]:
         """Media Close USD per anno (da 2013-2026)."""
-        df = pd.read_csv("data/BTC-USD.csv")
-        df.columns = [c.strip().lower() for c in df.columns]
-
-        df["snapped_at"] = pd.to_datetime(df["snapped_at"], utc=True, errors="coerce")
-        df["year"] = pd.DatetimeIndex(df["snapped_at"]).year
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-
-        return df.groupby("year")["price"].mean().to_dict()
+        # Parsing date e prezzi direttamente in read_csv (un solo passaggio).
+        df = pd.read_csv(
+            const.BTCFILE,
+            usecols=["snapped_at", "price"],
+            parse_dates=["snapped_at"],
+            date_format="%Y-%m-%d %H:%M:%S %Z",  # es. "2013-04-28 00:00:00 UTC"
+            dtype={"price": "float64"},
+        )
+        if not pd.api.types.is_datetime64_any_dtype(df["snapped_at"]):
+            # Formato inatteso: conversione tollerante (righe non valide → NaT).
+            df["snapped_at"] = pd.to_datetime(df["snapped_at"], utc=True, errors="coerce")
+
+        years = df["snapped_at"].dt.year.to_numpy()
+        return _yearly_mean(years, df["price"].to_numpy())
 
 
 class TimeseriesLoader:
@@ -52,20 +85,17 @@ class TimeseriesLoader:
     @staticmethod
     def _parse_year_series(data: list[dict]) -> Dict[int, float]:
         """Converte lista {x:ts_ms, y:value} → media annua."""
-        records = []
-        for item in data:
-            ts_ms = item["x"]
-            value = item["y"]
-            year = pd.to_datetime(ts_ms, unit="ms").year
-            records.append({"year": year, "value": value})
-        df = pd.DataFrame(records)
-        return df.groupby("year")["value"].mean().to_dict()
+        xs, ys = zip(*((item["x"], item["y"]) for item in data))
+        # Una sola conversione vettoriale dei timestamp (non una per record).
+        years = pd.to_datetime(np.asarray(xs), unit="ms").year.to_numpy()
+        values = np.asarray(ys, dtype=np.float64)
+        return _yearly_mean(years, values)
 
     @staticmethod
     def load_difficulty() -> Dict[int, float]:
         """Difficulty network media annua."""
-        with open("data/difficulty.json", encoding="utf-8") as f:
-            data = json.load(f)["difficulty"]
+        with open(const.DIFFICULTYFILE, "rb") as f:
+            data = orjson.loads(f.read())["difficulty"]
         result = TimeseriesLoader._parse_year_series(data)
         logger.info("Difficulty caricata: %d anni", len(result))
         return result
@@ -73,8 +103,8 @@ class TimeseriesLoader:
     @staticmethod
     def load_hashrate() -> Dict[int, float]:
         """Network hashrate medio annuo."""
-        with open("data/hash-rate.json", encoding="utf-8") as f:
-            data = json.load(f)["hash-rate"]
+        with open(const.HASHFILE, "rb") as f:
+            data = orjson.loads(f.read())["hash-rate"]
         result = TimeseriesLoader._parse_year_series(data)
         logger.info("Hashrate caricato: %d anni", len(result))
         return result
@@ -84,10 +114,13 @@ class DataFactory:
     """Factory per tutti i dati della simulazione."""
 
     @classmethod
+    @lru_cache(maxsize=1)
     def load_all(cls) -> Dict[str, Any]:
         """
         Carica dataset + forward-fill anni 2025-2045 con ultimi valori noti.
         (Conservativo: no previsioni ML).
+        Risultato memorizzato: i file sono letti una sola volta per processo
+        (il dict restituito è condiviso, da trattare in sola lettura).
         """
         data: Dict[str, Any] = {}
         data["pv_monthly"], data["pv_2020_total"] = PVDataLoader.load()
@@ -97,11 +130,11 @@ class DataFactory:
 
         # Estendi serie storiche a 2045.
         all_keys = ["btc_prices", "difficulty", "network_hr"]
-        for y in range(const.SIM_PARAMS.start_year, const.SIM_PARAMS.end_year + 1):
-            for k in all_keys:
-                if y not in data[k]:
-                    last_known = max(data[k].keys())
-                    data[k][y] = data[k][last_known]
+        anni = range(const.SIM_PARAMS.start_year, const.SIM_PARAMS.end_year + 1)
+        for k in all_keys:
+            last_val = data[k][max(data[k])]
+            existing = set(data[k])
+            data[k].update({y: last_val for y in anni if y not in existing})
 
         logger.info("✅ DataFactory: simulazione pronta (2020-2045)")
         return data
@@ -0,0 +1,102 @@
+"""
+src/models/_kernels.py
+Kernel numerici condivisi dai modelli FV e mining (array annui → colonne risultato).
+Compilati con Numba se installato (opzionale), altrimenti eseguiti come NumPy puro.
+Variante NumExpr (opzionale) per array grandi (sweep / Monte-Carlo).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba opzionale: stesse funzioni in NumPy puro.
+    njit = None
+
+try:
+    import numexpr as ne
+except ImportError:  # NumExpr opzionale: si usa simulate_mining.
+    ne = None
+
+
+def _jit(func):
+    """@njit(cache=True, fastmath=True) se Numba è disponibile, altrimenti no-op."""
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=True)(func)
+
+
+@_jit
+def simulate_pv(
+    energia: np.ndarray, prezzo_kwh: float, opex: float, capex: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vendita energia: ricavi = MWh * 1000 * prezzo, CF = ricavi - OPEX.
+    Restituisce (ricavi, cf_annuo, cash_cum) con cash_cum che parte da -CAPEX.
+    """
+    ricavi = energia * 1000.0 * prezzo_kwh
+    cf_annuo = ricavi - opex
+    cash_cum = -capex + np.cumsum(cf_annuo)
+    return ricavi, cf_annuo, cash_cum
+
+
+@_jit
+def simulate_mining(
+    reward: np.ndarray,
+    difficulty: np.ndarray,
+    price: np.ndarray,
+    pv: np.ndarray,
+    hashrate: float,
+    tempo_sec: float,
+    consumo_max: float,
+    opex: float,
+    capex: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mining: BTC = HR * TP * NRR / (ND * 2^32), energia usata = min(FV, consumo farm).
+    Restituisce (energia_usata, btc, ricavi, cf_annuo, cash_cum).
+    """
+    btc = hashrate * tempo_sec * reward / (difficulty * 4294967296.0)
+    energia_usata = np.minimum(pv, consumo_max)
+    ricavi = btc * price
+    cf_annuo = ricavi - opex
+    cash_cum = -capex + np.cumsum(cf_annuo)
+    return energia_usata, btc, ricavi, cf_annuo, cash_cum
+
+
+def simulate_mining_numexpr(
+    reward: np.ndarray,
+    difficulty: np.ndarray,
+    price: np.ndarray,
+    pv: np.ndarray,
+    hashrate: float,
+    tempo_sec: float,
+    consumo_max: float,
+    opex: float,
+    capex: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Come simulate_mining, con le espressioni elemento per elemento valutate da
+    NumExpr (multi-thread). Fallback su simulate_mining se NumExpr non è installato.
+    """
+    if ne is None:
+        return simulate_mining(
+            reward, difficulty, price, pv, hashrate, tempo_sec, consumo_max, opex, capex
+        )
+
+    btc = ne.evaluate(
+        "hashrate * tempo_sec * reward / (difficulty * pow2_32)",
+        local_dict={
+            "hashrate": hashrate,
+            "tempo_sec": tempo_sec,
+            "reward": reward,
+            "difficulty": difficulty,
+            "pow2_32": 4294967296.0,
+        },
+    )
+    energia_usata = np.minimum(pv, consumo_max)
+    ricavi = ne.evaluate("btc * price", local_dict={"btc": btc, "price": price})
+    cf_annuo = ne.evaluate("ricavi - opex", local_dict={"ricavi": ricavi, "opex": opex})
+    cash_cum = -capex + np.cumsum(cf_annuo)
+    return energia_usata, btc, ricavi, cf_annuo, cash_cum
@@ -4,28 +4,26 @@ Modello simulazione farm mining Bitcoin (159 Antminer S17).
 Formula BTC minati: HR * TP * NRR / (ND * 2^32).
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from src.config import constants as const
-from src.config.constants import get_block_reward
-from src.data.loader import DataFactory
-
-
-@dataclass
-class MiningYear:
-    """Record annuo per mining (colonne tabella output)."""
-
-    anno: int
-    energia_usata_mwh: float
-    btc_minati: float
-    prezzo_btc_usd: float
-    ricavi_usd: float
-    opex_usd: float
-    cashflow_annuo_usd: float
-    cashflow_cum_usd: float
+from src.config.constants import get_block_reward, get_block_reward_arr
+from src.models._kernels import simulate_mining, simulate_mining_numexpr
+
+# Colonne tabella mining (buffer colonnare, un array per colonna).
+MINING_COLUMNS = (
+    "anno",
+    "energia_usata_mwh",
+    "btc_minati",
+    "prezzo_btc_usd",
+    "ricavi_usd",
+    "opex_usd",
+    "cashflow_annuo_usd",
+    "cashflow_cum_usd",
+)
 
 
 class MiningFarm:
@@ -34,17 +32,31 @@ class MiningFarm:
     Energia usata = min(produzione FV, consumo farm costante 80k MWh/anno).
     """
 
-    def __init__(self, data_loader: DataFactory):
-        self.data = data_loader.load_all()
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
         self.hashrate_sistema = const.MINING_PARAMS.hashrate_sistema_hs
         self.tempo_sec_anno = const.MINING_PARAMS.seconds_per_year
         self.consumo_max_mwh = const.MINING_PARAMS.consumo_annuo_mwh
+        self._prepare_arrays()
         self.reset_simulation()
 
+    def _prepare_arrays(self) -> None:
+        """Serie annue (dict) → array float64 allineati a START_YEAR..END_YEAR."""
+        self._anni = np.arange(
+            const.SIM_PARAMS.start_year, const.SIM_PARAMS.end_year + 1
+        )
+        anni = self._anni.tolist()
+        self._difficulty_arr = np.array(
+            [self.data["difficulty"][y] for y in anni], dtype=np.float64
+        )
+        self._price_arr = np.array(
+            [self.data["btc_prices"][y] for y in anni], dtype=np.float64
+        )
+        self._reward_arr = get_block_reward_arr(self._anni)
+
     def reset_simulation(self) -> None:
-        """Reset stato (CAPEX iniziale negativo)."""
-        self._cash_cum: float = -const.PV_PARAMS.capex_totale_usd
-        self._years: List[MiningYear] = []
+        """Reset stato (nessun risultato salvato)."""
+        self._cols: Optional[Dict[str, np.ndarray]] = None
 
     def calculate_btc_mined(
         self, anno: int, energia_pv_mwh: float
@@ -62,45 +74,57 @@ class MiningFarm:
         btc_minati = btc_teorici  # Assumiamo efficienza 100% (semplificazione).
         return btc_minati, energia_usata
 
-    def calculate_yearly_cashflow(self, anno: int, energia_pv_mwh: float) -> MiningYear:
-        """Calcola CF annuo da BTC minati * prezzo BTC - OPEX."""
-        btc_minati, energia_usata = self.calculate_btc_mined(anno, energia_pv_mwh)
-        prezzo_btc = self.data["btc_prices"][anno]
-        ricavi = btc_minati * prezzo_btc
-        cf_annuo = ricavi - const.PV_PARAMS.opex_annuo_usd
-        self._cash_cum += cf_annuo
-
-        return MiningYear(
-            anno=anno,
-            energia_usata_mwh=round(energia_usata, 1),
-            btc_minati=round(btc_minati, 6),
-            prezzo_btc_usd=round(prezzo_btc, 0),
-            ricavi_usd=round(ricavi, 0),
-            opex_usd=const.PV_PARAMS.opex_annuo_usd,
-            cashflow_annuo_usd=round(cf_annuo, 0),
-            cashflow_cum_usd=round(self._cash_cum, 0),
-        )
-
-    def run_full_simulation(self, pv_productions: List) -> List[MiningYear]:
+    def run_full_simulation(
+        self, pv_results: Dict[str, np.ndarray], use_numexpr: bool = False
+    ) -> Dict[str, np.ndarray]:
         """
-        Simula 25 anni: per ogni anno usa energia FV disponibile.
-        pv_productions: lista oggetti produzione FV annua.
+        Simula 25 anni in forma vettoriale: per ogni anno usa energia FV disponibile.
+        pv_results: colonne risultato FV (da PVSystem.run_full_simulation).
+        use_numexpr: valuta le espressioni con NumExpr se installato (utile su sweep grandi).
         """
         self.reset_simulation()
-        for i, anno in enumerate(
-            range(const.SIM_PARAMS.start_year, const.SIM_PARAMS.end_year + 1)
-        ):
-            energia_pv = pv_productions[i].energia_mwh
-            year_record = self.calculate_yearly_cashflow(anno, energia_pv)
-            self._years.append(year_record)
-        return self._years
+        n = self._anni.size
+        capex = const.PV_PARAMS.capex_totale_usd
+        opex = const.PV_PARAMS.opex_annuo_usd
+        pv_arr = np.ascontiguousarray(pv_results["energia_mwh"], dtype=np.float64)
+
+        # BTC = HR * TP * NRR / (ND * 2^32); efficienza 100% (semplificazione).
+        kernel = simulate_mining_numexpr if use_numexpr else simulate_mining
+        energia_usata, btc, ricavi, cf_annuo, cash_cum = kernel(
+            self._reward_arr,
+            self._difficulty_arr,
+            self._price_arr,
+            pv_arr,
+            self.hashrate_sistema,
+            self.tempo_sec_anno,
+            self.consumo_max_mwh,
+            opex,
+            capex,
+        )
+
+        # Buffer SoA allocato una volta per run, riempito in place.
+        cols = {"anno": self._anni.copy()}
+        cols.update({c: np.empty(n, dtype=np.float64) for c in MINING_COLUMNS[1:]})
+        np.round(energia_usata, 1, out=cols["energia_usata_mwh"])
+        np.round(btc, 6, out=cols["btc_minati"])
+        np.round(self._price_arr, 0, out=cols["prezzo_btc_usd"])
+        np.round(ricavi, 0, out=cols["ricavi_usd"])
+        cols["opex_usd"].fill(opex)
+        np.round(cf_annuo, 0, out=cols["cashflow_annuo_usd"])
+        np.round(cash_cum, 0, out=cols["cashflow_cum_usd"])
+        self._cols = cols
+        return cols
 
     def get_dataframe(self) -> pd.DataFrame:
         """Restituisce tabella risultati (per UI/grafici)."""
-        return pd.DataFrame([y.__dict__ for y in self._years])
+        if self._cols is None:
+            return pd.DataFrame()
+        return pd.DataFrame(self._cols, copy=False)
 
     def find_payback_year(self) -> float:
         """Primo anno con CF cumulativo > 0 (o inf se mai)."""
-        df = self.get_dataframe()
-        positive = df[df["cashflow_cum_usd"] > 0]
-        return positive["anno"].iloc[0] if len(positive) > 0 else float("inf")
+        if self._cols is None:
+            raise ValueError("Run prima run_full_simulation()")
+        cash_cum = self._cols["cashflow_cum_usd"]
+        idx = int(np.argmax(cash_cum > 0))
+        return int(self._cols["anno"][idx]) if cash_cum[idx] > 0 else float("inf")
@@ -4,25 +4,27 @@ Simulatore impianto FV 50.91 MWp (tabelle 3-5 paper).
 Produzione: E_2020 * (1 - 0.0043)^(anno-2020).
 """
 
-from typing import List
-from dataclasses import dataclass
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from src.config import constants as const
-from src.data.loader import DataFactory
+from src.models._kernels import simulate_pv
 
+# Colonne tabella vendita energia (buffer colonnare, un array per colonna).
+PV_COLUMNS = (
+    "anno",
+    "energia_mwh",
+    "ricavi_vendita_usd",
+    "opex_usd",
+    "cashflow_annuo_usd",
+    "cashflow_cum_usd",
+)
 
-@dataclass
-class PVProductionYear:
-    """Record output annuo (colonne tabella vendita energia)."""
-
-    anno: int
-    energia_mwh: float
-    ricavi_vendita_usd: float
-    opex_usd: float
-    cashflow_annuo_usd: float
-    cashflow_cum_usd: float
+# Fattori di degrado (1 - d)^k per k = 0..N-1, fissati dai parametri di progetto.
+_YEARS = np.arange(0, const.SIM_PARAMS.end_year - const.SIM_PARAMS.start_year + 1)
+_DEGRADO = np.power(1.0 - const.PV_PARAMS.degrado_annuo, _YEARS, dtype=np.float64)
 
 
 class PVSystem:
@@ -31,15 +33,15 @@ class PVSystem:
     Degrado lineare 0.43%/anno (da paper).
     """
 
-    def __init__(self, data_loader: DataFactory):
-        self.data = data_loader.load_all()
+    def __init__(self, data: Dict[str, Any]):
+        # Dict da DataFactory.load_all() (caricato una volta dal chiamante).
+        self.data = data
         self.e_2020 = self.data["pv_2020_total"]  # Baseline 80890 MWh.
         self.reset_simulation()
 
     def reset_simulation(self) -> None:
-        """Reset per nuova run (CAPEX iniziale)."""
-        self._cash_cum = -const.PV_PARAMS.capex_totale_usd
-        self._productions: List[PVProductionYear] = []
+        """Reset per nuova run (nessun risultato salvato)."""
+        self._cols: Optional[Dict[str, np.ndarray]] = None
 
     def simulate_production(self, anno: int) -> float:
         """
@@ -47,47 +49,45 @@ class PVSystem:
         Degrado: 0.43%/anno lineare.
         """
         years_passed = anno - const.SIM_PARAMS.start_year
-        degrado_factor = (1 - const.PV_PARAMS.degrado_annuo) ** years_passed
-        return self.e_2020 * degrado_factor
+        if 0 <= years_passed < _DEGRADO.size:
+            return float(self.e_2020 * _DEGRADO[years_passed])
+        # Fuori dall'orizzonte di simulazione: calcolo diretto.
+        return self.e_2020 * (1 - const.PV_PARAMS.degrado_annuo) ** years_passed
 
-    def calculate_yearly_cashflow(
-        self, anno: int, energia_mwh: float
-    ) -> PVProductionYear:
+    def run_full_simulation(self) -> Dict[str, np.ndarray]:
         """
-        Ricavi: energia (MWh) → kWh * prezzo rete (0.094 USD/kWh).
-        CF = ricavi - OPEX annuo.
+        Simula 2020-2045 in forma vettoriale (NumPy) e salva le colonne risultato.
+        Ricavi: energia (MWh) → kWh * prezzo rete; CF = ricavi - OPEX annuo.
         """
-        ricavi = energia_mwh * 1000 * const.ENERGYPARAMS.prezzo_vendita_usd_kwh
-        cf_annuo = ricavi - const.PV_PARAMS.opex_annuo_usd
-        self._cash_cum += cf_annuo
-
-        record = PVProductionYear(
-            anno=anno,
-            energia_mwh=round(energia_mwh, 1),
-            ricavi_vendita_usd=round(ricavi, 0),
-            opex_usd=const.PV_PARAMS.opex_annuo_usd,
-            cashflow_annuo_usd=round(cf_annuo, 0),
-            cashflow_cum_usd=round(self._cash_cum, 0),
-        )
-        self._productions.append(record)
-        return record
-
-    def run_full_simulation(self) -> List[PVProductionYear]:
-        """Simula 2020-2045 e salva record interni."""
         self.reset_simulation()
-        for anno in range(const.SIM_PARAMS.start_year, const.SIM_PARAMS.end_year + 1):
-            energia = self.simulate_production(anno)
-            self.calculate_yearly_cashflow(anno, energia)
-        return self._productions
+        capex = const.PV_PARAMS.capex_totale_usd
+        opex = const.PV_PARAMS.opex_annuo_usd
+        prezzo = const.ENERGYPARAMS.prezzo_vendita_usd_kwh
+
+        energia = self.e_2020 * _DEGRADO
+        ricavi, cf_annuo, cash_cum = simulate_pv(energia, prezzo, opex, capex)
+
+        # Buffer SoA allocato una volta per run, riempito in place.
+        cols = {"anno": _YEARS + const.SIM_PARAMS.start_year}
+        cols.update({c: np.empty(_YEARS.size, dtype=np.float64) for c in PV_COLUMNS[1:]})
+        np.round(energia, 1, out=cols["energia_mwh"])
+        np.round(ricavi, 0, out=cols["ricavi_vendita_usd"])
+        cols["opex_usd"].fill(opex)
+        np.round(cf_annuo, 0, out=cols["cashflow_annuo_usd"])
+        np.round(cash_cum, 0, out=cols["cashflow_cum_usd"])
+        self._cols = cols
+        return cols
 
     def get_dataframe(self) -> pd.DataFrame:
         """Tabella risultati (per UI e tabelle Markdown)."""
-        if not self._productions:
+        if self._cols is None:
             raise ValueError("Run prima run_full_simulation()")
-        return pd.DataFrame([p.__dict__ for p in self._productions])
+        return pd.DataFrame(self._cols, copy=False)
 
     def find_payback_year(self) -> float:
         """Primo anno CF cumulativo positivo."""
-        df = self.get_dataframe()
-        positive_cf = df[df["cashflow_cum_usd"] > 0]
-        return positive_cf["anno"].iloc[0] if not positive_cf.empty else float("inf")
+        if self._cols is None:
+            raise ValueError("Run prima run_full_simulation()")
+        cash_cum = self._cols["cashflow_cum_usd"]
+        idx = int(np.argmax(cash_cum > 0))  # 0 anche se mai positivo: verifico sotto.
+        return int(self._cols["anno"][idx]) if cash_cum[idx] > 0 else float("inf")
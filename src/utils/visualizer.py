@@ -13,12 +13,29 @@ from src.calculations.cashflow import CashflowAnalyzer
 from src.config import constants as const
 
 
+@st.cache_resource
+def _get_analyzer() -> CashflowAnalyzer:
+    """Analyzer condiviso tra i rerun Streamlit (dati caricati una sola volta)."""
+    return CashflowAnalyzer()
+
+
+@st.cache_data
+def _run_analysis(
+    capex: float, opex: float, prezzo_kwh: float
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, float]]:
+    """
+    Risultati simulazione memorizzati tra i rerun, per parametri della sidebar.
+    (I parametri fanno da chiave: il modello usa ancora i valori di constants.)
+    """
+    return _get_analyzer().run_complete_analysis()
+
+
 class StreamlitVisualizer:
     """UI tesi: sidebar parametri + risultati."""
 
     def __init__(self):
         st.set_page_config(page_title="PV vs Mining", layout="wide")
-        self.analyzer = CashflowAnalyzer()
+        self.analyzer = _get_analyzer()
         self._init_session_state()
 
     def _init_session_state(self) -> None:
@@ -173,7 +190,11 @@ class StreamlitVisualizer:
 
         if st.button("Esegui simulazione 25 anni", type="primary"):
             with st.spinner("Calcolo cash flow..."):
-                results = self.analyzer.run_complete_analysis()
+                results = _run_analysis(
+                    st.session_state.capex,
+                    st.session_state.opex,
+                    st.session_state.prezzo_kwh,
+                )
             self.render_results(results)
 
         self.render_methodology()